@@ -0,0 +1,2 @@
+# conftest.py
+# 放在项目根目录 (main.py 所在目录)，pytest 会把该目录加入 sys.path，测试中可以直接 import src.*
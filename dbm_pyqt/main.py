@@ -1,12 +1,21 @@
 import sys
 from PyQt5.QtWidgets import QApplication
 from src.gui.windows.main_window import DBMWindow # 假设主窗口类在 main_window.py 中
+from src.utils.config_reader import Config
+from src.utils.event_log import event_log, parse_level
 
 def main():
+    config = Config()
+    event_log.level = parse_level(config.get("log_level")) # 事件日志级别，未配置时为 INFO
+    event_log.install_crash_handler() # 崩溃时保存最近的事件
+    event_log.start()
+
     app = QApplication(sys.argv)
     main_win = DBMWindow() # 创建主窗口实例
     main_win.show()       # 显示主窗口
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    event_log.stop()
+    sys.exit(exit_code)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
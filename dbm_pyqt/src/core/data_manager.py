@@ -2,11 +2,13 @@
 import json
 import os
 from src.utils.resource import get_resource_path
+from src.core.encounter import SkillGraph
 
 class DataManager:
     def __init__(self):
         self.boss_data = []
         self.boss_skill_data_map = {} #  使用字典存储 Boss 技能数据，key: boss_name, value: skills_list
+        self.skill_graph_map = {} #  编译后的技能图缓存，key: boss_name, value: SkillGraph
         self.data_folder = os.path.join("resources", "data")
         self.boss_data_file = os.path.join(self.data_folder, "bosses.json")
 
@@ -34,6 +36,7 @@ class DataManager:
         处理 Boss 数据，提取技能数据并存储到 boss_skill_data_map 中。
         """
         self.boss_skill_data_map = {} #  清空之前的技能数据
+        self.skill_graph_map = {}
         for boss in self.boss_data:
             boss_name = boss.get('name')
             skills = boss.get('skills', []) # 获取技能列表，如果不存在则默认为空列表
@@ -57,14 +60,13 @@ class DataManager:
         根据 Boss 名称获取技能数据。
         """
         return self.boss_skill_data_map.get(boss_name, []) #  如果找不到 Boss 的技能数据，返回空列表
-    
-    def get_skill_data_by_name(self, boss_name, skill_name):
+
+    def get_skill_graph(self, boss_name):
         """
-        根据 Boss 名称和技能名称查找并返回技能数据字典。
+        根据 Boss 名称获取编译后的技能图，首次获取时编译并缓存。找不到 Boss 时返回 None。
         """
-        skill_data_list = self.get_boss_skill_data(boss_name)
-        if skill_data_list:
-            for skill_data in skill_data_list:
-                if skill_data.get('name') == skill_name:
-                    return skill_data # 找到匹配的技能数据，返回字典
-        return None # 如果 Boss 或技能未找到，返回 None
\ No newline at end of file
+        skill_graph = self.skill_graph_map.get(boss_name)
+        if skill_graph is None and boss_name in self.boss_skill_data_map:
+            skill_graph = SkillGraph(boss_name, self.boss_skill_data_map[boss_name])
+            self.skill_graph_map[boss_name] = skill_graph
+        return skill_graph
@@ -0,0 +1,176 @@
+# src/core/encounter.py
+import itertools
+from src.utils.event_log import event_log
+
+
+class SkillGraph:
+    """
+    编译后的 Boss 技能图。
+    技能按名称建立索引，triggered_skills 在编译时解析为技能数据列表，运行时查找均为 O(1)。
+    """
+    def __init__(self, boss_name, skills):
+        self.boss_name = boss_name
+        self.skills = {} #  key: 技能名称, value: 技能数据字典
+        self.followups = {} #  key: 技能名称, value: 被触发技能数据列表
+        self.first_skill = skills[0] if skills else None
+
+        for skill_data in skills:
+            skill_name = skill_data.get('name')
+            if skill_name:
+                self.skills[skill_name] = skill_data
+
+        for skill_name, skill_data in self.skills.items():
+            followups = []
+            for triggered_skill_name in skill_data.get('triggered_skills', []):
+                triggered_skill_data = self.skills.get(triggered_skill_name)
+                if triggered_skill_data:
+                    followups.append(triggered_skill_data)
+                else:
+                    event_log.warning("被触发技能数据未找到", boss=boss_name, skill=skill_name, triggered=triggered_skill_name)
+            self.followups[skill_name] = followups
+
+    def get_skill(self, skill_name):
+        """
+        根据技能名称返回技能数据字典，找不到时返回 None。
+        """
+        return self.skills.get(skill_name)
+
+    def get_followups(self, skill_name):
+        """
+        返回技能结束后需要触发的技能数据列表。
+        """
+        return self.followups.get(skill_name, [])
+
+
+class Encounter:
+    """
+    一场战斗 (遭遇) 实例。
+    每个实例拥有自己的技能图、禁用计时器集合、运行中的计时器和等待中的触发检查，
+    多个实例 (如小怪和 Boss) 可以同时运行，互不影响。
+    """
+    def __init__(self, encounter_id, skill_graph):
+        self.encounter_id = encounter_id
+        self.skill_graph = skill_graph
+        self.forbidden_timer_names = set()
+        self.active_timers = set()
+        self.pending_checks = {} #  等待中的触发检查 (条件订阅)，key: 技能名称, value: 未返回的检查数量
+        self.is_active = True
+
+    @property
+    def boss_name(self):
+        return self.skill_graph.boss_name
+
+    def get_skill(self, skill_name):
+        return self.skill_graph.get_skill(skill_name)
+
+    def get_followups(self, skill_name):
+        return self.skill_graph.get_followups(skill_name)
+
+    def is_forbidden(self, skill_name):
+        return skill_name in self.forbidden_timer_names
+
+    def forbid(self, skill_names):
+        self.forbidden_timer_names.update(skill_names)
+
+    def add_timer(self, skill_timer):
+        self.active_timers.add(skill_timer)
+
+    def remove_timer(self, skill_timer):
+        self.active_timers.discard(skill_timer)
+
+    def subscribe(self, skill_name):
+        """
+        记录一次已放入队列、尚未返回结果的触发检查。
+        """
+        self.pending_checks[skill_name] = self.pending_checks.get(skill_name, 0) + 1
+
+    def unsubscribe(self, skill_name):
+        """
+        触发检查返回结果后，移除对应的订阅。
+        """
+        count = self.pending_checks.get(skill_name, 0) - 1
+        if count > 0:
+            self.pending_checks[skill_name] = count
+        else:
+            self.pending_checks.pop(skill_name, None)
+
+    def is_idle(self):
+        """
+        没有运行中的计时器和等待中的触发检查时，遭遇已经结束。
+        """
+        return not self.active_timers and not self.pending_checks
+
+    def stop(self):
+        """
+        停止遭遇，结束所有计时器，不再触发后续技能。
+        """
+        self.is_active = False
+        for skill_timer in list(self.active_timers):
+            skill_timer.stop_timer()
+        self.active_timers.clear()
+        self.pending_checks.clear()
+        self.forbidden_timer_names.clear()
+
+
+class EncounterManager:
+    """
+    管理所有同时运行的遭遇实例，按 ID 查找为 O(1)。
+    """
+    def __init__(self):
+        self.encounters = {} #  key: 遭遇 ID, value: Encounter
+        self._next_id = itertools.count(1)
+
+    def start_encounter(self, skill_graph):
+        """
+        为技能图创建并登记一个新的遭遇实例。
+        """
+        encounter = Encounter(next(self._next_id), skill_graph)
+        self.encounters[encounter.encounter_id] = encounter
+        event_log.info("遭遇开始", encounter=encounter.encounter_id, boss=skill_graph.boss_name, active=len(self.encounters))
+        return encounter
+
+    def get_encounter(self, encounter_id):
+        """
+        根据 ID 返回运行中的遭遇，已结束时返回 None。
+        """
+        return self.encounters.get(encounter_id)
+
+    def release_if_idle(self, encounter):
+        """
+        遭遇没有运行中的计时器和等待中的检查时，将其移除。
+        """
+        if encounter.is_idle() and self.encounters.pop(encounter.encounter_id, None) is not None:
+            encounter.is_active = False
+            event_log.info("遭遇结束", encounter=encounter.encounter_id, boss=encounter.boss_name, active=len(self.encounters))
+
+    def stop_encounter(self, encounter_id):
+        """
+        停止并移除指定遭遇。
+        """
+        encounter = self.encounters.pop(encounter_id, None)
+        if encounter:
+            encounter.stop()
+            event_log.info("遭遇已停止", encounter=encounter_id, boss=encounter.boss_name, active=len(self.encounters))
+
+    def stop_boss_encounters(self, boss_name):
+        """
+        停止并移除指定 Boss 的所有遭遇，其他遭遇不受影响。
+        """
+        for encounter_id, encounter in list(self.encounters.items()):
+            if encounter.boss_name == boss_name:
+                self.stop_encounter(encounter_id)
+
+    def stop_all(self):
+        """
+        停止并移除所有遭遇。
+        """
+        for encounter_id in list(self.encounters):
+            self.stop_encounter(encounter_id)
+
+    def clear_pending_checks(self):
+        """
+        丢弃所有遭遇中等待中的触发检查 (工作线程停止后，队列中的任务不会再返回结果)，并移除因此空闲的遭遇。
+        """
+        for encounter in list(self.encounters.values()):
+            encounter.pending_checks.clear()
+            self.release_if_idle(encounter)
@@ -5,8 +5,10 @@ import json  # 导入 json 模块
 import os    # 导入 os 模块
 
 from src.core.data_manager import DataManager
+from src.core.encounter import EncounterManager
 from src.gui.windows.timer_overlay_window import TimerOverlayWindow, SkillTimer
 from src.utils.trigger_check_thread import TriggerCheckThread
+from src.utils.event_log import event_log
 
 class DBMWindow(QWidget):
     # 配置文件路径
@@ -21,6 +23,7 @@ class DBMWindow(QWidget):
 
         self.data_manager = DataManager()
         self.data_manager.load_boss_data()
+        self.encounter_manager = EncounterManager() # 管理同时运行的多个遭遇 (每个遭遇拥有独立的技能图、禁用集合和计时器)
 
         # ---- UI 布局调整 ---- (保持不变) ----
         main_layout = QHBoxLayout(self)
@@ -45,6 +48,12 @@ class DBMWindow(QWidget):
         self.start_timer_button = QPushButton("触发技能倒计时")
         self.start_timer_button.clicked.connect(self.start_first_timer)
         timer_control_layout.addWidget(self.start_timer_button)
+        self.stop_boss_timers_button = QPushButton("停止当前 Boss 倒计时")
+        self.stop_boss_timers_button.clicked.connect(self.stop_selected_boss_encounters)
+        timer_control_layout.addWidget(self.stop_boss_timers_button)
+        self.stop_all_timers_button = QPushButton("停止全部倒计时")
+        self.stop_all_timers_button.clicked.connect(self.stop_all_encounters)
+        timer_control_layout.addWidget(self.stop_all_timers_button)
         main_layout.addLayout(timer_control_layout)
         # ---- 布局调整结束 ----
 
@@ -56,11 +65,11 @@ class DBMWindow(QWidget):
         self.overlay_window.show()
         self.is_edit_mode_enabled = False
         self.start_trigger_check_thread() #  启动触发检查线程  <--- 启动线程
-        self.forbidden_timer_names = set()
 
 
     def closeEvent(self, event):
         self.save_window_position() # 保存窗口位置
+        self.encounter_manager.stop_all() # 停止所有遭遇
         self.stop_trigger_check_thread() #  停止触发检查线程  <--- 停止线程
         self.overlay_window.close()
         event.accept()
@@ -88,6 +97,7 @@ class DBMWindow(QWidget):
             self.trigger_check_thread.stop_worker()
             self.trigger_check_thread.trigger_check_finished.disconnect(self.handle_trigger_check_result) # 断开信号连接
             self.trigger_check_thread = None #  设置为 None，方便下次重新创建
+            self.encounter_manager.clear_pending_checks() # 队列中未处理的任务随线程丢弃，不会再返回结果
             print("触发检查线程已停止")
         else:
             print("触发检查线程未运行或未创建，无需停止")
@@ -99,7 +109,6 @@ class DBMWindow(QWidget):
     def on_boss_item_clicked(self, item):
         # ... (on_boss_item_clicked 方法保持不变) ...
         self.boss_description_label.setTextFormat(Qt.RichText)
-        self.forbidden_timer_names.clear()
 
 
     def on_boss_selected(self, index):
@@ -115,61 +124,82 @@ class DBMWindow(QWidget):
 
     def start_first_timer(self):
         """
-        触发选定 Boss 的技能倒计时 (临时实现：触发所有技能的无条件倒计时)。
+        为选定的 Boss 开始一个新的遭遇，并触发其第一个技能。
+        已在运行的遭遇不受影响，可以同时运行多个遭遇 (如小怪和 Boss)。
         """
         selected_boss_name = self.boss_selection_combobox.currentText() # 获取选定的 Boss 名称
         if selected_boss_name == "请选择 Boss":
-            print("请先选择 Boss")
+            event_log.info("请先选择 Boss")
             return
 
-        skill_data_list = self.data_manager.get_boss_skill_data(selected_boss_name) # 获取选定 Boss 的技能数据
-        if skill_data_list:
-            skill_data = skill_data_list[0]
-            if skill_data:
-                self.try_start_new_timer(skill_data)
+        skill_graph = self.data_manager.get_skill_graph(selected_boss_name) # 获取选定 Boss 编译后的技能图
+        if skill_graph and skill_graph.first_skill:
+            encounter = self.encounter_manager.start_encounter(skill_graph)
+            self.try_start_new_timer(encounter, skill_graph.first_skill)
+            self.encounter_manager.release_if_idle(encounter) # 第一个技能无法触发时直接结束遭遇
         else:
-            print(f"未找到 Boss '{selected_boss_name}' 的技能数据")
+            event_log.warning("未找到 Boss 的技能数据", boss=selected_boss_name)
 
-    def try_start_new_timer(self, skill_data):
+    def stop_selected_boss_encounters(self):
+        """
+        停止下拉框中选定 Boss 的遭遇及其倒计时，其他 Boss 的遭遇继续运行。
+        """
+        selected_boss_name = self.boss_selection_combobox.currentText()
+        if selected_boss_name == "请选择 Boss":
+            event_log.info("请先选择 Boss")
+            return
+        self.encounter_manager.stop_boss_encounters(selected_boss_name)
+
+    def stop_all_encounters(self):
+        """
+        停止所有正在运行的遭遇及其倒计时。
+        """
+        self.encounter_manager.stop_all()
+
+    def try_start_new_timer(self, encounter, skill_data):
         trigger_condition = skill_data.get('trigger_condition')
 
         if trigger_condition in ["unconditional", "condition_image"]: #  只处理 unconditional 和 condition_image 触发条件
-            print(f"将技能 '{skill_data.get('name')}' 的触发检查任务放入队列")
-            self.trigger_check_thread.enqueue_task(skill_data) # 将技能数据作为任务放入队列 <---  放入任务队列
+            event_log.debug("触发检查任务放入队列", encounter=encounter.encounter_id, skill=skill_data.get('name'))
+            encounter.subscribe(skill_data.get('name')) # 记录等待中的触发检查
+            self.trigger_check_thread.enqueue_task(encounter.encounter_id, skill_data) # 将遭遇 ID 和技能数据作为任务放入队列 <---  放入任务队列
         else:
-            print(f"未知触发条件类型: {trigger_condition}，技能 '{skill_data.get('name')}' 无法触发")
+            event_log.warning("未知触发条件类型，技能无法触发", encounter=encounter.encounter_id, skill=skill_data.get('name'), condition=trigger_condition)
 
 
-    @pyqtSlot(str, bool) #  槽函数，接收技能名称和触发结果
-    def handle_trigger_check_result(self, skill_name, result):
+    @pyqtSlot(int, str, bool) #  槽函数，接收遭遇 ID、技能名称和触发结果
+    def handle_trigger_check_result(self, encounter_id, skill_name, result):
         """
         处理触发检查线程返回的触发结果。  运行在 GUI 线程中。
         """
-        print(f"接收到技能 '{skill_name}' 的触发检查结果: {result}")
+        event_log.debug("接收到触发检查结果", encounter=encounter_id, skill=skill_name, result=result)
+        encounter = self.encounter_manager.get_encounter(encounter_id) # 按 ID 查找结果所属的遭遇
+        if encounter is None:
+            event_log.debug("遭遇已结束，忽略触发检查结果", encounter=encounter_id, skill=skill_name)
+            return
+        encounter.unsubscribe(skill_name)
+
         if result: # 触发条件满足
-            skill_data_list = self.data_manager.get_boss_skill_data(self.boss_selection_combobox.currentText()) #  重新获取 Boss 技能数据
-            if skill_data_list:
-                for skill_data in skill_data_list:
-                    if skill_data.get('name') == skill_name: #  找到对应的技能数据
-                        skill_name = skill_data.get('name')
-                        if skill_name in self.forbidden_timer_names:
-                            print(f"技能 '{skill_name}' 被禁用，跳过")
-                            continue
-                        duration_seconds = skill_data.get('countdown_duration')
-                        progress_bar_text = skill_data.get('progress_bar_text', "")
-                        progress_bar_color = skill_data.get('progress_bar_color')
-                        show_progress = skill_data.get('show', True)
-                        
-                        forbidden_timer_names = skill_data.get('forbidden_timer_names', [])
-                        for forbidden_timer_name in forbidden_timer_names:
-                            self.forbidden_timer_names.add(forbidden_timer_name)
-
-                        skill_timer = SkillTimer(skill_name, duration_seconds, self.overlay_window, self, progress_bar_text, progress_bar_color, show_progress)
-                        skill_timer.start_timer()
-                        print(f"触发条件满足，启动技能倒计时 (工作线程触发): {skill_name}, 持续时间: {duration_seconds}秒, 提示: {progress_bar_text}, 颜色: {progress_bar_color}, 显示进度条: {show_progress}")
-                        break # 找到技能后跳出循环
+            skill_data = encounter.get_skill(skill_name) # 从遭遇自己的技能图中查找技能数据
+            if skill_data:
+                if encounter.is_forbidden(skill_name):
+                    event_log.debug("技能被禁用，跳过", encounter=encounter_id, skill=skill_name)
+                else:
+                    duration_seconds = skill_data.get('countdown_duration')
+                    progress_bar_text = skill_data.get('progress_bar_text', "")
+                    progress_bar_color = skill_data.get('progress_bar_color')
+                    show_progress = skill_data.get('show', True)
+
+                    encounter.forbid(skill_data.get('forbidden_timer_names', []))
+
+                    skill_timer = SkillTimer(skill_name, duration_seconds, self.overlay_window, self, encounter, progress_bar_text, progress_bar_color, show_progress)
+                    encounter.add_timer(skill_timer)
+                    skill_timer.start_timer()
+                    event_log.info("触发条件满足，启动技能倒计时", encounter=encounter_id, skill=skill_name, duration=duration_seconds, text=progress_bar_text, color=progress_bar_color, show=show_progress)
         else:
-            print(f"技能 '{skill_name}' 的触发条件不满足，未触发倒计时")
+            event_log.debug("触发条件不满足，未触发倒计时", encounter=encounter_id, skill=skill_name)
+
+        self.encounter_manager.release_if_idle(encounter) # 没有计时器和等待中的检查时结束遭遇
 
 
     def toggle_edit_mode(self, state):
@@ -2,6 +2,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QProgressBar
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QPoint
 from src.utils.image_utils import detect_image_on_screen
+from src.utils.event_log import event_log
 
 
 class TimerOverlayWindow(QWidget):
@@ -99,7 +100,7 @@ class TimerOverlayWindow(QWidget):
 
 
 class SkillTimer:
-    def __init__(self, skill_name, duration_seconds, overlay_window, main_window, progress_bar_text="", progress_bar_color=None, show=True): # 添加 progress_bar_color 参数，默认值为 None
+    def __init__(self, skill_name, duration_seconds, overlay_window, main_window, encounter, progress_bar_text="", progress_bar_color=None, show=True): # 添加 progress_bar_color 参数，默认值为 None
         self.duration_update_scale = 10;
         self.timer_interval = 10
 
@@ -107,6 +108,7 @@ class SkillTimer:
         self.duration_seconds = duration_seconds
         self.overlay_window = overlay_window
         self.main_window = main_window
+        self.encounter = encounter # 计时器所属的遭遇，后续技能只在该遭遇的技能图中查找
         self.progress_bar_text = progress_bar_text
 
         self.progress_bar = QProgressBar()
@@ -192,21 +194,17 @@ class SkillTimer:
             else:
                 self.overlay_window.skill_timers.remove(self)
 
+            self.encounter.remove_timer(self)
+
              #  -----  新增：触发其他计时器  -----
-            boss_name = self.main_window.boss_selection_combobox.currentText() # 获取当前选中的 Boss 名称
-            skill_data = self.main_window.data_manager.get_skill_data_by_name(boss_name, self.skill_name) # 获取 Boss 数据
-            
-            if skill_data:
-                triggered_skill_names = skill_data.get('triggered_skills', []) # 获取 triggered_skills 列表
-                if triggered_skill_names:
-                    print(f"技能 '{self.skill_name}' 结束，触发以下技能: {triggered_skill_names}")
-                    for triggered_skill_name in triggered_skill_names:
-                        triggered_skill_data = self.main_window.data_manager.get_skill_data_by_name(boss_name, triggered_skill_name) # 获取被触发技能的数据
-                        if triggered_skill_data:
-                            print(f"  - 启动被触发技能: {triggered_skill_data.get('name')}")                            
-                            self.main_window.try_start_new_timer(triggered_skill_data)
-                        else:
-                            print(f"  - 警告: 被触发技能 '{triggered_skill_name}' 数据未找到")
+            if self.encounter.is_active: # 遭遇已停止时不再触发后续技能
+                triggered_skills = self.encounter.get_followups(self.skill_name) # 从遭遇自己的技能图获取后续技能，不受 Boss 下拉框切换影响
+                if triggered_skills:
+                    event_log.debug("技能结束，触发后续技能", encounter=self.encounter.encounter_id, skill=self.skill_name, triggered=len(triggered_skills))
+                    for triggered_skill_data in triggered_skills:
+                        event_log.debug("启动被触发技能", encounter=self.encounter.encounter_id, skill=triggered_skill_data.get('name'))
+                        self.main_window.try_start_new_timer(self.encounter, triggered_skill_data)
+                self.main_window.encounter_manager.release_if_idle(self.encounter)
             #  -----  触发其他计时器结束  -----
 
 
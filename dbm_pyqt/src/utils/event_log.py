@@ -0,0 +1,232 @@
+# src/utils/event_log.py
+import collections
+import itertools
+import os
+import sys
+import threading
+import time
+import traceback
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+class EventLog:
+    """
+    低开销的结构化事件日志。
+    记录只保存 (序号, 时间, 级别, 事件, 字段) 元组，追加到固定容量的环形缓冲区 (deque 的 append 和 itertools.count 的 next 在 GIL 下都是原子操作，无需加锁)，
+    由后台写线程用 popleft() 取出、按序号排序、格式化并输出，调用线程不做任何控制台 I/O。
+    写线程来不及取出时最旧的记录会被覆盖，输出中会以一行提示说明丢弃的数量。
+    级别未启用时直接返回，不会格式化任何内容。
+    字段值应为字符串或数字等简单值，不要传入异常等对象，以免缓冲区让其引用的栈帧和局部变量无法释放。
+    """
+    def __init__(self, capacity=1024, level=INFO, stream=None, flush_interval=0.2):
+        self.level = level
+        self.stream = stream # 输出流，为 None 时使用 sys.stderr (打包后的无控制台程序中 sys.stderr 为 None，此时只保留在历史记录中)
+        self.flush_interval = flush_interval # 写线程的输出间隔 (秒)
+        self._ring = collections.deque(maxlen=capacity) # 待写出的记录，写线程来不及取出时最旧的记录会被覆盖
+        self._history = collections.deque(maxlen=capacity) # 已取出的最近记录，用于崩溃时输出
+        self._seq = itertools.count(1) # 记录时编号，用于发现被覆盖的记录
+        self._last_seq = 0 # 已取出的最大序号
+        self._suspect_dropped = 0 # 上次取出时发现的序号缺口，下次取出时仍未到达才算作丢弃
+        self._unwritten = [] # 已取出但尚未写出的记录 (recent() 取出的记录留到下次 flush() 写出)
+        self._unreported_dropped = 0
+        self._writer_thread = None
+        self._stop_event = threading.Event()
+        self._write_lock = threading.RLock() # 只在取出和写出时使用，记录事件时不加锁
+
+    def is_enabled(self, level):
+        """
+        判断指定级别是否启用，用于跳过调用方开销较大的准备工作。
+        """
+        return level >= self.level
+
+    def log(self, level, event, **fields):
+        """
+        记录一条事件。event 为固定的事件描述，可变内容通过关键字参数传入，延迟到写线程中格式化。
+        """
+        if level < self.level:
+            return
+        self._ring.append((next(self._seq), time.time(), level, event, fields))
+
+    def debug(self, event, **fields):
+        if DEBUG >= self.level:
+            self._ring.append((next(self._seq), time.time(), DEBUG, event, fields))
+
+    def info(self, event, **fields):
+        if INFO >= self.level:
+            self._ring.append((next(self._seq), time.time(), INFO, event, fields))
+
+    def warning(self, event, **fields):
+        if WARNING >= self.level:
+            self._ring.append((next(self._seq), time.time(), WARNING, event, fields))
+
+    def error(self, event, **fields):
+        if ERROR >= self.level:
+            self._ring.append((next(self._seq), time.time(), ERROR, event, fields))
+
+    def start(self):
+        """
+        启动后台写线程。
+        """
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="EventLogWriter", daemon=True)
+        self._writer_thread.start()
+
+    def stop(self):
+        """
+        停止后台写线程，并写出缓冲区中剩余的事件。
+        """
+        self._stop_event.set()
+        if self._writer_thread is not None:
+            self._writer_thread.join(2)
+            self._writer_thread = None
+        with self._write_lock:
+            self._drain()
+            self._unreported_dropped += self._suspect_dropped # 不会再有记录到达，剩余的缺口都是丢弃的记录
+            self._suspect_dropped = 0
+            self.flush()
+
+    def flush(self):
+        """
+        取出缓冲区中的新事件，放入历史记录并写出。缓冲区写满后被覆盖的事件会以一行提示代替。
+        """
+        with self._write_lock:
+            self._drain()
+            records, self._unwritten = self._unwritten, []
+            dropped, self._unreported_dropped = self._unreported_dropped, 0
+            if not records and not dropped:
+                return
+
+            stream = self.stream if self.stream is not None else sys.stderr
+            if stream is None:
+                return
+            lines = []
+            if dropped:
+                lines.append(f"... 丢弃了 {dropped} 条事件 (缓冲区已满)\n")
+            lines.extend(format_record(record) for record in records)
+            try:
+                stream.write("".join(lines))
+                stream.flush()
+            except Exception:
+                pass
+
+    def recent(self, count=None):
+        """
+        返回最近的 count 条事件记录 (不指定时返回历史记录中的全部记录)，包括尚未写出的记录。
+        只读取，不向输出流写入。
+        """
+        with self._write_lock:
+            self._drain()
+            records = list(self._history)
+        return records if count is None else records[-count:]
+
+    def _drain(self):
+        """
+        取出环形缓冲区中的记录，按序号排序后放入历史记录和待写出列表，并统计被覆盖的记录数。调用方需持有写锁。
+        记录的序号在追加之前取得，两个线程同时记录时可能晚一步到达，因此本次发现的缺口留到下次取出时再确认。
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._ring.popleft())
+            except IndexError:
+                break
+        if not batch and not self._suspect_dropped:
+            return
+        batch.sort(key=lambda record: record[0])
+
+        late = 0 # 属于上次缺口、晚到达的记录数
+        gaps = 0
+        for record in batch:
+            seq = record[0]
+            if seq <= self._last_seq:
+                late += 1
+            else:
+                gaps += seq - self._last_seq - 1
+                self._last_seq = seq
+            self._history.append(record)
+            self._unwritten.append(record)
+        self._unreported_dropped += max(0, self._suspect_dropped - late)
+        self._suspect_dropped = gaps
+
+    def dump_recent(self, stream, count=200):
+        """
+        把最近的 count 条事件写入 stream，用于崩溃时保留现场。
+        """
+        records = self.recent(count)
+        stream.write(f"---- 最近 {len(records)} 条事件 ----\n")
+        stream.write("".join(format_record(record) for record in records))
+
+    def install_crash_handler(self, dump_file="crash_dump.log", count=200):
+        """
+        安装未捕获异常处理函数 (主线程和其他线程)。
+        崩溃时把异常信息和最近的事件写入 dump_file，写出 stderr 上尚未输出的事件，交给原来的处理函数输出异常，然后结束进程。
+        PyQt5 在安装了自定义 sys.excepthook 后不会再因槽函数中的异常而退出，
+        这里主动结束进程，避免程序带着只更新了一半的状态继续运行。
+        """
+        previous_excepthook = sys.excepthook
+        previous_threading_excepthook = threading.excepthook
+
+        def write_crash_dump(exc_type, exc_value, exc_traceback, thread_name):
+            text = [f"==== 未捕获异常 ({thread_name}) {time.strftime('%Y-%m-%d %H:%M:%S')} ====\n"]
+            text.extend(traceback.format_exception(exc_type, exc_value, exc_traceback))
+            try:
+                with open(dump_file, 'a', encoding='utf-8') as f:
+                    f.write("".join(text))
+                    self.dump_recent(f, count)
+            except Exception:
+                pass
+            self.flush() # 最近的事件已经按顺序写到过 stderr，这里只补上尚未写出的部分
+
+        def excepthook(exc_type, exc_value, exc_traceback):
+            write_crash_dump(exc_type, exc_value, exc_traceback, threading.current_thread().name)
+            try:
+                previous_excepthook(exc_type, exc_value, exc_traceback)
+            finally:
+                os._exit(1)
+
+        def threading_excepthook(args):
+            thread_name = args.thread.name if args.thread is not None else "unknown"
+            write_crash_dump(args.exc_type, args.exc_value, args.exc_traceback, thread_name)
+            try:
+                previous_threading_excepthook(args)
+            finally:
+                os._exit(1)
+
+        sys.excepthook = excepthook
+        threading.excepthook = threading_excepthook
+
+    def _writer_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+
+def format_record(record):
+    """
+    把一条事件记录格式化为一行文本。
+    """
+    seq, timestamp, level, event, fields = record
+    time_text = time.strftime('%H:%M:%S', time.localtime(timestamp))
+    milliseconds = int((timestamp % 1) * 1000)
+    field_text = "".join(f" {key}={value}" for key, value in fields.items())
+    return f"{time_text}.{milliseconds:03d} {LEVEL_NAMES.get(level, level)} {event}{field_text}\n"
+
+
+def parse_level(name, default=INFO):
+    """
+    把配置中的级别名称 (如 "DEBUG") 转换为级别数值，无法识别时返回 default。
+    """
+    for level, level_name in LEVEL_NAMES.items():
+        if isinstance(name, str) and name.upper() == level_name:
+            return level
+    return default
+
+
+event_log = EventLog()
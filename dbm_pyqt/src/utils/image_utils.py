@@ -1,31 +1,96 @@
 # src/utils/image_utils.py
 import cv2
-import pygetwindow as gw
 import pyautogui
 import numpy as np
 import os
 import json
 from .config_reader import Config
-from PIL import Image
+from .window_tracker import WindowTracker
+from .event_log import event_log
 
+_window_tracker = None
+_template_scale = (1.0, 1.0) # 模板缩放比例 (x, y)，由窗口跟踪器在几何信息变化时更新
+_template_cache = {} # 原始模板缓存，key: 图片路径
+_scaled_template_cache = {} # 缩放后的模板缓存，key: 图片路径，缩放比例变化时清空
 
-def detect_image_on_screen(image_path):
-    config = Config()
-    windows = gw.getWindowsWithTitle('ZhuxianClient')
-    if not windows:
-        print("窗口未找到")
-        return False
+
+def get_window_tracker():
+    """
+    获取图像识别使用的窗口跟踪器，首次调用时按配置创建默认跟踪器。
+    """
+    if _window_tracker is None:
+        config = Config()
+        refresh_interval = config.get("window_refresh_interval")
+        set_window_tracker(WindowTracker('ZhuxianClient', refresh_interval=refresh_interval if refresh_interval is not None else 2.0))
+    return _window_tracker
+
+
+def set_window_tracker(tracker):
+    """
+    替换图像识别使用的窗口跟踪器 (例如在无桌面环境的测试中使用替身后端)。
+    """
+    global _window_tracker
+    if _window_tracker is not None:
+        _window_tracker.remove_listener(_on_window_geometry_changed)
+    _window_tracker = tracker
+    _on_window_geometry_changed(tracker.geometry)
+    tracker.add_listener(_on_window_geometry_changed)
+
+
+def _on_window_geometry_changed(geometry):
+    """
+    窗口几何信息变化回调，更新模板缩放比例。
+    模板按 screenshot_default_width/height 分辨率制作，这里把模板缩放到实际窗口大小，
+    从而不必每次都把截图放大到默认分辨率。
+    """
+    global _template_scale
+    if geometry is None:
+        template_scale = (1.0, 1.0)
     else:
-        window = windows[0]
+        config = Config()
+        _, _, width, height = geometry
+        template_scale = (width / config.get("screenshot_default_width"), height / config.get("screenshot_default_height"))
+    if template_scale != _template_scale: # 只移动窗口时缩放比例不变，保留已缩放的模板
+        _template_scale = template_scale
+        _scaled_template_cache.clear()
 
-        # 确保窗口是激活的
-        #window.activate()
 
-        # 获取窗口的位置和大小
-        left, top, width, height = window.left, window.top, window.width, window.height
-        print(f"窗口位置: ({left}, {top}), 大小: ({width}, {height})")
-        # 读取模板图像
+def _get_scaled_template(image_path):
+    """
+    读取模板图像并按当前窗口大小缩放，结果会被缓存。读取失败时返回 None。
+    """
+    template = _scaled_template_cache.get(image_path)
+    if template is not None:
+        return template
+
+    template = _template_cache.get(image_path)
+    if template is None:
         template = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if template is None:
+            return None
+        _template_cache[image_path] = template
+
+    scale_x, scale_y = _template_scale
+    if (scale_x, scale_y) != (1.0, 1.0):
+        height, width = template.shape[:2]
+        size = (max(1, round(width * scale_x)), max(1, round(height * scale_y)))
+        interpolation = cv2.INTER_AREA if scale_x * scale_y < 1.0 else cv2.INTER_LINEAR
+        template = cv2.resize(template, size, interpolation=interpolation)
+    _scaled_template_cache[image_path] = template
+    return template
+
+
+def detect_image_on_screen(image_path):
+    tracker = get_window_tracker()
+    geometry = tracker.get_geometry()
+    if geometry is None:
+        event_log.debug("窗口未找到")
+        return False
+    else:
+        # 获取窗口当前的位置和大小 (窗口跟踪器缓存窗口句柄，每次读取最新位置)
+        left, top, width, height = geometry
+        # 读取模板图像
+        template = _get_scaled_template(image_path)
 
         if template is None:
             return False
@@ -34,13 +99,20 @@ def detect_image_on_screen(image_path):
         threshold = 0.7
 
         # 获取窗口截图
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        screenshot = screenshot.resize([config.get("screenshot_default_width"), config.get("screenshot_default_height")], Image.Resampling.BILINEAR)
+        try:
+            screenshot = pyautogui.screenshot(region=(left, top, width, height))
+        except Exception as e:
+            event_log.warning("窗口截图失败", error=repr(e)) # 只保存文本，避免异常的 traceback 让截图等局部变量常驻缓冲区
+            tracker.invalidate() # 截图失败时丢弃缓存的窗口，下次重新查找
+            return False
         screenshot = np.array(screenshot)
 
         # 转换颜色通道顺序（从 BGR 到 RGB）
         screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGR2RGB)
 
+        if template.shape[0] > screenshot.shape[0] or template.shape[1] > screenshot.shape[1]:
+            return False
+
         # 进行模板匹配
 
         res = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
@@ -48,9 +120,8 @@ def detect_image_on_screen(image_path):
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
 
         if max_val >= threshold:
-            print(f"屏幕上检测到图片: {image_path} 可信度: {max_val:.4f}")
+            event_log.debug("屏幕上检测到图片", image=image_path, confidence=max_val)
             return True
         else:
-            print(f"屏幕上未检测到图片: {image_path} 可信度: {max_val:.4f}")
+            event_log.debug("屏幕上未检测到图片", image=image_path, confidence=max_val)
             return False
-
@@ -2,6 +2,7 @@
 from PyQt5.QtCore import QThread, pyqtSignal
 import queue, os
 from src.utils.image_utils import detect_image_on_screen # 假设 detect_image_on_screen 函数在 image_utils.py 中
+from src.utils.event_log import event_log
 
 class TriggerCheckThread(QThread):
     """
@@ -9,7 +10,7 @@ class TriggerCheckThread(QThread):
     负责在后台线程执行各种触发条件检查任务，并将结果通过信号发送回主线程。
     使用队列接收触发检查任务。
     """
-    trigger_check_finished = pyqtSignal(str, bool)  # 定义信号，参数1: 技能名称 (str)，参数2: 触发结果 (bool)
+    trigger_check_finished = pyqtSignal(int, str, bool)  # 定义信号，参数1: 遭遇 ID (int)，参数2: 技能名称 (str)，参数3: 触发结果 (bool)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -24,55 +25,55 @@ class TriggerCheckThread(QThread):
             task = self.task_queue.get() # 从队列中取出任务，如果队列为空，线程会等待直到有任务
 
             if not self.is_running:
-                print("在 get() 后检测到线程停止信号，准备退出线程循环")
+                event_log.info("在 get() 后检测到线程停止信号，准备退出线程循环")
                 break # 立即退出 while 循环
 
             if task:
-                skill_data = task #  任务就是技能数据 (字典)
+                encounter_id, skill_data = task #  任务为 (遭遇 ID, 技能数据字典)
                 skill_name = skill_data.get('name')
                 trigger_condition = skill_data.get('trigger_condition')
                 param = skill_data.get('param')
                 recognition_result = False # 默认识别结果为 False
 
                 try:
-                    print(f"触发检查线程开始处理技能: {skill_name}, 触发条件: {trigger_condition}")
+                    event_log.debug("触发检查线程开始处理技能", skill=skill_name, condition=trigger_condition)
                     if trigger_condition == "unconditional":
                         recognition_result = True # 无条件触发，直接设置为 True
-                        print(f"技能 '{skill_name}' (无条件触发) 检查完成，结果: {recognition_result}")
+                        event_log.debug("无条件触发检查完成", skill=skill_name, result=recognition_result)
 
                     elif trigger_condition == "condition_image":
                         if param:
                             image_path = os.path.join('resources', 'images', param) 
-                            print(f"技能 '{skill_name}' (图像识别触发) 开始图像识别，目标图片: {image_path}")
+                            event_log.debug("图像识别触发开始识别", skill=skill_name, image=image_path)
                             recognition_result = detect_image_on_screen(image_path) # 执行图像识别
-                            print(f"技能 '{skill_name}' (图像识别触发) 图像识别完成，结果: {recognition_result}, 图片: {image_path}")
+                            event_log.debug("图像识别触发识别完成", skill=skill_name, result=recognition_result, image=image_path)
                         else:
-                            print(f"警告: 技能 '{skill_name}' (图像识别触发) 配置不完整，缺少图片路径")
+                            event_log.warning("图像识别触发配置不完整，缺少图片路径", skill=skill_name)
 
 
                     if self.is_running: # 检查线程是否仍然运行
-                        self.trigger_check_finished.emit(skill_name, recognition_result) # 发射信号，传递技能名称和触发结果
+                        self.trigger_check_finished.emit(encounter_id, skill_name, recognition_result) # 发射信号，传递遭遇 ID、技能名称和触发结果
 
                 except Exception as e:
-                    print(f"触发检查线程处理技能 '{skill_name}' 时发生错误: {e}")
+                    event_log.error("触发检查线程处理技能时发生错误", skill=skill_name, error=repr(e))
                     if self.is_running:
-                        self.trigger_check_finished.emit(skill_name, False) # 发生错误时，也发送触发失败的信号
+                        self.trigger_check_finished.emit(encounter_id, skill_name, False) # 发生错误时，也发送触发失败的信号
                 finally:
-                    print(f"触发检查线程完成技能 '{skill_name}' 的处理")
+                    event_log.debug("触发检查线程完成技能处理", skill=skill_name)
             else:
                 if not self.is_running: # 队列为空时，再次检查 self.is_running，如果为 False，则退出循环 <--- 关键检查
-                    print("队列为空时检测到线程停止信号，准备退出线程循环")
+                    event_log.info("队列为空时检测到线程停止信号，准备退出线程循环")
                     break # 退出 while 循环
                 self.msleep(50) #  队列为空时，休眠一段时间，避免 CPU 占用过高
 
-        print("触发检查线程已退出")
+        event_log.info("触发检查线程已退出")
 
 
-    def enqueue_task(self, task_data):
+    def enqueue_task(self, encounter_id, task_data):
         """
         将触发检查任务放入队列。
         """
-        self.task_queue.put(task_data)
+        self.task_queue.put((encounter_id, task_data))
 
 
     def stop_worker(self):
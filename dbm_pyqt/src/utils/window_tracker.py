@@ -0,0 +1,140 @@
+# src/utils/window_tracker.py
+import threading
+import time
+from .event_log import event_log
+
+
+class PyGetWindowBackend:
+    """
+    基于 pygetwindow 的窗口查找后端 (默认后端)。
+    """
+    def find_window(self, title):
+        """
+        按标题查找窗口，返回窗口句柄对象，找不到时返回 None。开销较大，需要遍历所有顶层窗口。
+        """
+        import pygetwindow as gw # 延迟导入，无桌面环境下可以换用其他后端
+        windows = gw.getWindowsWithTitle(title)
+        return windows[0] if windows else None
+
+    def get_geometry(self, window):
+        """
+        读取窗口几何信息，返回 (left, top, width, height)。只读取一次窗口矩形，开销很小。
+        """
+        return tuple(window.box)
+
+
+class WindowTracker:
+    """
+    游戏窗口跟踪器。
+    缓存窗口句柄，每次 get_geometry() 只读取该句柄的窗口矩形 (开销很小)，窗口移动或改变大小能立即反映到截图区域。
+    只有句柄失效 (窗口关闭、最小化、读取失败) 或调用 invalidate() 后才按标题重新查找窗口，
+    窗口未找到时按 refresh_interval 间隔重试，避免每次检查都遍历所有顶层窗口。
+    窗口几何信息发生变化时，会通知通过 add_listener() 注册的回调函数。
+    """
+    def __init__(self, title='ZhuxianClient', backend=None, refresh_interval=2.0, clock=time.monotonic):
+        self.title = title
+        self.backend = backend if backend is not None else PyGetWindowBackend()
+        self.refresh_interval = refresh_interval # 窗口未找到时重新查找的间隔 (秒)
+        self.clock = clock
+        self.window = None # 缓存的窗口句柄
+        self.geometry = None # 最近一次读取的窗口位置和大小 (left, top, width, height)
+        self.last_lookup_time = None # 最近一次按标题查找的时间，None 表示需要立即查找
+        self.last_lookup_seconds = 0.0 # 最近一次查找耗时 (秒)
+        self.lookup_count = 0 # 查找次数
+        self.total_lookup_seconds = 0.0 # 查找累计耗时 (秒)
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """
+        注册几何信息变化回调，回调参数为新的 (left, top, width, height)，窗口丢失时为 None。
+        """
+        with self._lock:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        移除几何信息变化回调。
+        """
+        with self._lock:
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+
+    def get_geometry(self):
+        """
+        返回窗口的 (left, top, width, height)，窗口未找到时返回 None。
+        """
+        with self._lock:
+            geometry = None
+            if self.window is not None: # 读取缓存句柄的当前位置和大小
+                try:
+                    geometry = self._read_geometry(self.window)
+                except Exception:
+                    geometry = None
+                if geometry is None: # 句柄失效，立即重新查找
+                    self.window = None
+                    self.last_lookup_time = None
+
+            if self.window is None and self._is_lookup_due():
+                geometry = self._lookup()
+
+            changed = geometry != self.geometry
+            self.geometry = geometry
+            listeners = list(self.listeners) if changed else []
+
+        for callback in listeners: # 在锁外通知，避免回调中再次访问跟踪器时死锁
+            callback(geometry)
+        return geometry
+
+    def invalidate(self):
+        """
+        丢弃缓存的窗口句柄，下次 get_geometry() 时强制重新查找 (例如截图失败后调用)。
+        """
+        with self._lock:
+            self.window = None
+            self.last_lookup_time = None
+
+    def get_average_lookup_seconds(self):
+        """
+        返回平均每次查找的耗时 (秒)。
+        """
+        if self.lookup_count == 0:
+            return 0.0
+        return self.total_lookup_seconds / self.lookup_count
+
+    def _is_lookup_due(self):
+        if self.last_lookup_time is None:
+            return True
+        return self.clock() - self.last_lookup_time >= self.refresh_interval
+
+    def _lookup(self):
+        """
+        按标题查找窗口并读取几何信息，找不到时返回 None。调用方需持有锁。
+        """
+        start = time.perf_counter()
+        geometry = None
+        try:
+            self.window = self.backend.find_window(self.title)
+            if self.window is not None:
+                geometry = self._read_geometry(self.window)
+        except Exception:
+            geometry = None
+        if geometry is None:
+            self.window = None
+
+        elapsed = time.perf_counter() - start
+        self.last_lookup_seconds = elapsed
+        self.lookup_count += 1
+        self.total_lookup_seconds += elapsed
+        self.last_lookup_time = self.clock()
+        event_log.debug("窗口查找", seconds=elapsed, average=self.total_lookup_seconds / self.lookup_count, found=geometry is not None)
+        return geometry
+
+    def _read_geometry(self, window):
+        """
+        读取并校验窗口几何信息，窗口最小化或尺寸无效时返回 None。
+        """
+        left, top, width, height = self.backend.get_geometry(window)
+        if width <= 0 or height <= 0 or left <= -32000: # Windows 下最小化窗口的坐标为 (-32000, -32000)
+            return None
+        return (int(left), int(top), int(width), int(height))
@@ -0,0 +1,83 @@
+# tests/test_encounter.py
+from src.core.encounter import SkillGraph, EncounterManager
+
+
+SKILLS = [
+    {"name": "开始", "trigger_condition": "unconditional", "triggered_skills": ["循环检测"]},
+    {"name": "循环检测", "trigger_condition": "unconditional", "triggered_skills": ["循环检测", "开战检测", "不存在"]},
+    {"name": "开战检测", "trigger_condition": "condition_image", "forbidden_timer_names": ["循环检测"]},
+]
+
+
+class FakeTimer:
+    def __init__(self):
+        self.stopped = False
+
+    def stop_timer(self):
+        self.stopped = True
+
+
+def test_skill_graph_resolves_followups():
+    graph = SkillGraph("测试 Boss", SKILLS)
+
+    assert graph.first_skill["name"] == "开始"
+    assert [skill["name"] for skill in graph.get_followups("循环检测")] == ["循环检测", "开战检测"]
+    assert graph.get_followups("开战检测") == []
+    assert graph.get_skill("不存在") is None
+
+
+def test_encounters_keep_separate_forbidden_sets():
+    manager = EncounterManager()
+    graph = SkillGraph("测试 Boss", SKILLS)
+    first = manager.start_encounter(graph)
+    second = manager.start_encounter(graph)
+
+    first.forbid(["循环检测"])
+    assert first.is_forbidden("循环检测")
+    assert not second.is_forbidden("循环检测")
+
+
+def test_stop_boss_encounters_leaves_other_bosses_running():
+    manager = EncounterManager()
+    boss = manager.start_encounter(SkillGraph("Boss", SKILLS))
+    trash = manager.start_encounter(SkillGraph("小怪", SKILLS))
+    timer = FakeTimer()
+    trash.add_timer(timer)
+    boss.subscribe("循环检测")
+
+    manager.stop_boss_encounters("小怪")
+
+    assert timer.stopped
+    assert not trash.is_active
+    assert manager.get_encounter(trash.encounter_id) is None
+    assert manager.get_encounter(boss.encounter_id) is boss
+
+
+def test_encounter_is_released_when_idle():
+    manager = EncounterManager()
+    encounter = manager.start_encounter(SkillGraph("Boss", SKILLS))
+    encounter.subscribe("开始")
+    encounter.subscribe("开始")
+
+    encounter.unsubscribe("开始")
+    manager.release_if_idle(encounter)
+    assert manager.get_encounter(encounter.encounter_id) is encounter
+
+    encounter.unsubscribe("开始")
+    manager.release_if_idle(encounter)
+    assert manager.get_encounter(encounter.encounter_id) is None
+
+
+def test_clear_pending_checks_releases_waiting_encounters():
+    manager = EncounterManager()
+    waiting = manager.start_encounter(SkillGraph("Boss", SKILLS))
+    waiting.subscribe("循环检测")
+    running = manager.start_encounter(SkillGraph("小怪", SKILLS))
+    running.subscribe("开战检测")
+    running.add_timer(FakeTimer())
+
+    manager.clear_pending_checks()
+
+    assert manager.get_encounter(waiting.encounter_id) is None
+    assert manager.get_encounter(running.encounter_id) is running
+    assert running.pending_checks == {}
@@ -0,0 +1,55 @@
+# tests/test_event_log.py
+import io
+
+from src.utils.event_log import EventLog, DEBUG, INFO
+
+
+def make_log(capacity=1024, level=DEBUG):
+    stream = io.StringIO()
+    return EventLog(capacity=capacity, level=level, stream=stream), stream
+
+
+def test_disabled_level_is_not_recorded():
+    event_log, stream = make_log(level=INFO)
+    event_log.debug("调试事件", value=1)
+    event_log.info("普通事件", value=2)
+    event_log.flush()
+
+    assert "调试事件" not in stream.getvalue()
+    assert "普通事件 value=2" in stream.getvalue()
+
+
+def test_overwritten_records_are_reported_as_dropped():
+    event_log, stream = make_log(capacity=4)
+    for i in range(6):
+        event_log.debug("事件", i=i)
+    event_log.stop()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "... 丢弃了 2 条事件 (缓冲区已满)"
+    assert [line.split()[-1] for line in lines[1:]] == ["i=2", "i=3", "i=4", "i=5"]
+
+
+def test_late_record_is_not_counted_as_dropped():
+    event_log, stream = make_log()
+    event_log._ring.append((1, 0.0, DEBUG, "a", {}))
+    event_log._ring.append((3, 0.0, DEBUG, "c", {})) # 序号 2 的记录尚未追加
+    event_log.flush()
+    event_log._ring.append((2, 0.0, DEBUG, "b", {}))
+    event_log.stop()
+
+    output = stream.getvalue()
+    assert "丢弃" not in output
+    assert [line.split()[-1] for line in output.splitlines()] == ["a", "c", "b"]
+
+
+def test_recent_does_not_write_and_records_are_written_once():
+    event_log, stream = make_log()
+    event_log.info("事件", i=1)
+
+    assert [record[4] for record in event_log.recent()] == [{"i": 1}]
+    assert stream.getvalue() == ""
+
+    event_log.flush()
+    event_log.flush()
+    assert stream.getvalue().count("事件 i=1") == 1
@@ -0,0 +1,121 @@
+# tests/test_window_tracker.py
+from src.utils.window_tracker import WindowTracker
+
+
+class FakeWindowBackend:
+    """
+    替身窗口后端，用于无桌面环境的测试。geometry 为 None 时表示窗口不存在。
+    """
+    def __init__(self, geometry=None):
+        self.geometry = geometry
+        self.find_count = 0
+        self.read_count = 0
+        self.fail_reads = False
+
+    def find_window(self, title):
+        self.find_count += 1
+        return title if self.geometry is not None else None
+
+    def get_geometry(self, window):
+        self.read_count += 1
+        if self.fail_reads or self.geometry is None:
+            raise OSError("窗口句柄已失效")
+        return self.geometry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_tracker(geometry=None):
+    backend = FakeWindowBackend(geometry)
+    clock = FakeClock()
+    tracker = WindowTracker('ZhuxianClient', backend=backend, refresh_interval=2.0, clock=clock)
+    return tracker, backend, clock
+
+
+def test_window_is_found_once_and_geometry_read_every_call():
+    tracker, backend, _ = make_tracker((0, 0, 1920, 1080))
+
+    assert tracker.get_geometry() == (0, 0, 1920, 1080)
+    assert tracker.get_geometry() == (0, 0, 1920, 1080)
+    assert backend.find_count == 1
+    assert backend.read_count == 2
+    assert tracker.lookup_count == 1
+
+
+def test_window_move_is_seen_without_new_lookup():
+    tracker, backend, _ = make_tracker((0, 0, 1920, 1080))
+    tracker.get_geometry()
+
+    backend.geometry = (100, 50, 1920, 1080)
+    assert tracker.get_geometry() == (100, 50, 1920, 1080)
+    assert backend.find_count == 1
+
+
+def test_missing_window_is_retried_on_refresh_interval():
+    tracker, backend, clock = make_tracker(None)
+
+    assert tracker.get_geometry() is None
+    assert tracker.get_geometry() is None
+    assert backend.find_count == 1
+
+    backend.geometry = (0, 0, 1280, 720)
+    clock.now = 1.0
+    assert tracker.get_geometry() is None
+    clock.now = 2.0
+    assert tracker.get_geometry() == (0, 0, 1280, 720)
+    assert backend.find_count == 2
+
+
+def test_lost_handle_triggers_immediate_lookup():
+    tracker, backend, _ = make_tracker((0, 0, 1920, 1080))
+    tracker.get_geometry()
+
+    backend.fail_reads = True
+    assert tracker.get_geometry() is None
+    assert backend.find_count == 2 # 读取失败后立即重新查找一次
+
+    backend.fail_reads = False
+    assert tracker.get_geometry() is None # 之后按刷新间隔重试
+    assert backend.find_count == 2
+
+
+def test_invalidate_forces_lookup():
+    tracker, backend, _ = make_tracker((0, 0, 1920, 1080))
+    tracker.get_geometry()
+
+    tracker.invalidate()
+    assert tracker.get_geometry() == (0, 0, 1920, 1080)
+    assert backend.find_count == 2
+
+
+def test_minimized_window_is_treated_as_missing():
+    tracker, _, _ = make_tracker((-32000, -32000, 160, 28))
+    assert tracker.get_geometry() is None
+
+
+def test_listeners_receive_only_changes():
+    tracker, backend, _ = make_tracker((0, 0, 1920, 1080))
+    seen = []
+    tracker.add_listener(seen.append)
+
+    tracker.get_geometry()
+    tracker.get_geometry()
+    backend.geometry = (10, 10, 2560, 1440)
+    tracker.get_geometry()
+    tracker.invalidate()
+    backend.geometry = None
+    tracker.get_geometry()
+
+    assert seen == [(0, 0, 1920, 1080), (10, 10, 2560, 1440), None]
+
+    tracker.remove_listener(seen.append)
+    backend.geometry = (0, 0, 1920, 1080)
+    tracker.invalidate()
+    tracker.get_geometry()
+    assert len(seen) == 3